@@ -1,11 +1,10 @@
 #!/usr/bin/env python3
 """Camera Relay systray indicator — thin wrapper around the camera-relay CLI."""
 
-import json
 import os
-import subprocess
+import signal
 import sys
-import threading
+from collections import namedtuple
 
 # Require a display server
 if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
@@ -26,7 +25,7 @@ except OSError:
 import gi
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GLib
+from gi.repository import Gtk, GLib, Gio
 
 # Try AppIndicator3 (GNOME with extension, KDE, others)
 USE_APPINDICATOR = False
@@ -42,14 +41,78 @@ except (ValueError, ImportError):
     except (ValueError, ImportError):
         pass
 
+# orjson parses the small status payload faster; stdlib json is the fallback
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 RELAY_CMD = "/usr/local/bin/camera-relay"
-POLL_INTERVAL = 5  # seconds
+STATUS_FILE = os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "camera-relay.status.json")
+ACTION_TIMEOUT = 15  # seconds
+STATUS_TIMEOUT = 4  # seconds
+RESYNC_INTERVAL = 60  # seconds; safety net in case a file event is missed
+QUIT_TIMEOUT = 10  # seconds, per command run before closing
+Status = namedtuple("Status", "running persistent state pid")
+STATUS_UNKNOWN = Status(False, False, "stopped", 0)
+
+# Every status line the menu can show, keyed by (state, persistent)
+_STATE_LABELS = {
+    "stopped": "Status: STOPPED",
+    "idle": "Status: ON-DEMAND (idle)",
+    "streaming": "Status: STREAMING",
+    "running": "Status: RUNNING",
+}
+_STATUS_LABELS = {
+    (state, persistent): label + (" (persistent)" if persistent else "")
+    for state, label in _STATE_LABELS.items()
+    for persistent in (False, True)
+}
+
+
+def _parse_status(payload):
+    """Parse the status JSON into a Status; raises ValueError if malformed."""
+    data = _json.loads(payload)
+    if not isinstance(data, dict):
+        raise ValueError("status is not a JSON object")
+    # The file may live in a shared /tmp, so only trust a plain PID number
+    pid = data.get("pid", 0)
+    if type(pid) is not int or pid < 0:
+        raise ValueError(f"invalid relay PID: {pid!r}")
+    return Status(
+        bool(data.get("running")),
+        bool(data.get("persistent")),
+        data.get("state", "stopped"),
+        pid,
+    )
+
+
+def _is_stale(running, pid):
+    """True if a relay reported as running has no live process."""
+    if not running or not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except (PermissionError, OverflowError, ValueError):
+        pass
+    return False
 
 
 class CameraRelaySystray:
     def __init__(self):
         self.running = False
         self.persistent = False
+        self.state = "stopped"
+        self.pid = 0
+        self._last_state = None
+        self._last_stamp = None
+        self._last_icon = "camera-video-symbolic"  # initial icon set below
+        self._inflight_cancel = None
+        self._inflight_timeout = None
+        self._poll_pending = False
+        self._menu = self._build_menu()
 
         if USE_APPINDICATOR:
             self.indicator = AppIndicator3.Indicator.new(
@@ -58,7 +121,7 @@ class CameraRelaySystray:
                 AppIndicator3.IndicatorCategory.HARDWARE,
             )
             self.indicator.set_status(AppIndicator3.IndicatorStatus.ACTIVE)
-            self.indicator.set_menu(self._build_menu())
+            self.indicator.set_menu(self._menu)
         else:
             print(
                 "camera-relay-systray: AppIndicator3 not available. "
@@ -76,9 +139,14 @@ class CameraRelaySystray:
             self.status_icon.connect("popup-menu", self._on_status_icon_popup)
             self.status_icon.set_visible(True)
 
-        # Initial status check, then poll
-        self._poll_status()
-        GLib.timeout_add_seconds(POLL_INTERVAL, self._poll_status)
+        # Initial status check once the icon is up, then follow the status
+        # file for changes
+        GLib.idle_add(self._initial_poll, priority=GLib.PRIORITY_LOW)
+        self._status_monitor = Gio.File.new_for_path(STATUS_FILE).monitor_file(
+            Gio.FileMonitorFlags.NONE, None
+        )
+        self._status_monitor.connect("changed", self._on_status_file_changed)
+        GLib.timeout_add_seconds(RESYNC_INTERVAL, self._poll_status, priority=GLib.PRIORITY_LOW)
 
     def _build_menu(self):
         menu = Gtk.Menu()
@@ -117,51 +185,141 @@ class CameraRelaySystray:
         return menu
 
     def _on_status_icon_popup(self, icon, button, time):
-        menu = self._build_menu()
-        menu.popup(None, None, Gtk.StatusIcon.position_menu, icon, button, time)
+        self._menu.popup(None, None, Gtk.StatusIcon.position_menu, icon, button, time)
 
     def _get_status(self):
+        """Read the status file published by the CLI on every state change."""
+        self._inflight_cancel = Gio.Cancellable()
+        self._inflight_timeout = GLib.timeout_add_seconds(
+            STATUS_TIMEOUT, self._cancel_on_timeout, self._inflight_cancel
+        )
+        Gio.File.new_for_path(STATUS_FILE).load_contents_async(
+            self._inflight_cancel, self._on_status_contents
+        )
+
+    def _on_status_contents(self, status_file, result):
+        try:
+            _ok, data, _etag = status_file.load_contents_finish(result)
+        except GLib.Error as e:
+            if e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.NOT_FOUND):
+                # Relay older than the status file, or never run this session
+                self._get_status_from_cli()
+            elif e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                self._finish_status(None)
+            else:
+                self._last_stamp = None  # read again on the next poll
+                self._finish_status(STATUS_UNKNOWN)
+            return
+        try:
+            status = _parse_status(data)
+        except (ValueError, TypeError):
+            self._last_stamp = None  # read again on the next poll
+            status = STATUS_UNKNOWN
+        if _is_stale(status.running, status.pid):
+            # The relay died without rewriting the file (crash, SIGKILL, or
+            # gst exiting after 'start --foreground'). The CLI checks the PID
+            # itself and republishes the file.
+            self._get_status_from_cli()
+            return
+        self._finish_status(status)
+
+    def _get_status_from_cli(self):
+        """Request status from the CLI without blocking the main loop."""
         try:
-            result = subprocess.run(
+            proc = Gio.Subprocess.new(
                 [RELAY_CMD, "status", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=5,
+                Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_SILENCE,
             )
-            return json.loads(result.stdout)
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
-            return {"running": False, "persistent": False, "camera": "", "device": ""}
+        except GLib.Error:
+            self._finish_status(STATUS_UNKNOWN)
+            return
+        proc.communicate_utf8_async(None, self._inflight_cancel, self._on_status_done)
+
+    def _cancel_on_timeout(self, cancellable):
+        cancellable.cancel()
+        return False
+
+    def _on_status_done(self, proc, result):
+        if self._inflight_cancel.is_cancelled():
+            proc.force_exit()
+            self._finish_status(None)
+            return
+        try:
+            _ok, stdout, _stderr = proc.communicate_utf8_finish(result)
+            status = _parse_status(stdout)
+        except (GLib.Error, ValueError, TypeError):
+            status = STATUS_UNKNOWN
+        self._finish_status(status)
+
+    def _finish_status(self, status):
+        """End the in-flight status request and apply its result, if any."""
+        if not self._inflight_cancel.is_cancelled():
+            GLib.source_remove(self._inflight_timeout)
+        self._inflight_cancel = None
+        self._inflight_timeout = None
+        if status is None:
+            self._last_stamp = None  # timed out; read again on the next poll
+        else:
+            self._update_status(status)
+        if self._poll_pending:
+            self._poll_pending = False
+            self._poll_status()
+
+    def _initial_poll(self):
+        self._poll_status()
+        return False  # one-shot; _poll_status itself returns True
+
+    def _on_status_file_changed(self, _monitor, _file, _other_file, _event_type):
+        self._poll_status()
 
     def _poll_status(self):
-        status = self._get_status()
-        self.running = status.get("running", False)
-        self.persistent = status.get("persistent", False)
-        self.state = status.get("state", "stopped")
+        if self._inflight_cancel:
+            # Don't stack requests behind a slow one; poll again once it ends
+            self._poll_pending = True
+            return True
+        # The CLI rewrites the status file on every transition, so an
+        # unchanged (mtime, size) means the last parsed status still holds,
+        # unless the relay it names has died without rewriting it.
+        try:
+            st = os.stat(STATUS_FILE)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if (
+            stamp is not None
+            and stamp == self._last_stamp
+            and not _is_stale(self.running, self.pid)
+        ):
+            return True
+        self._last_stamp = stamp
+        self._get_status()
+        return True  # keep polling
+
+    def _update_status(self, status):
+        self.running, self.persistent, self.state, self.pid = status
+
+        # Only touch widgets on a transition to avoid needless tray redraws
+        if status == self._last_state:
+            return
+        self._last_state = status
 
         # Update menu labels
-        if hasattr(self, "item_toggle"):
-            if self.running:
-                self.item_toggle.set_label("Stop Relay")
-            else:
-                self.item_toggle.set_label("Start Relay")
-        if hasattr(self, "item_persistent"):
-            self.item_persistent.set_label(
-                "Disable Persistent Mode"
-                if self.persistent
-                else "Enable Persistent Mode"
-            )
-        if hasattr(self, "item_status"):
-            if not self.running:
-                label = "Status: STOPPED"
-            elif self.state == "idle":
-                label = "Status: ON-DEMAND (idle)"
-            elif self.state == "streaming":
-                label = "Status: STREAMING"
-            else:
-                label = "Status: RUNNING"
-            if self.persistent:
-                label += " (persistent)"
-            self.item_status.set_label(label)
+        if self.running:
+            self.item_toggle.set_label("Stop Relay")
+        else:
+            self.item_toggle.set_label("Start Relay")
+        self.item_persistent.set_label(
+            "Disable Persistent Mode"
+            if self.persistent
+            else "Enable Persistent Mode"
+        )
+        if not self.running:
+            shown = "stopped"
+        elif self.state in ("idle", "streaming"):
+            shown = self.state
+        else:
+            shown = "running"
+        self.item_status.set_label(_STATUS_LABELS[(shown, self.persistent)])
 
         # Update icon: streaming=active, idle/on-demand=ready, stopped=disabled
         if self.running and self.state == "streaming":
@@ -171,47 +329,67 @@ class CameraRelaySystray:
         else:
             icon = "camera-disabled-symbolic"
 
+        # Persistent toggles change the state key but not the icon
+        if icon == self._last_icon:
+            return
+        self._last_icon = icon
         if USE_APPINDICATOR:
             self.indicator.set_icon(icon)
         else:
             self.status_icon.set_from_icon_name(icon)
 
-        return True  # keep polling
-
     def _on_toggle(self, _widget):
         action = "stop" if self.running else "start"
         # Disable toggle while action is in progress
-        if hasattr(self, "item_toggle"):
-            self.item_toggle.set_label("Stopping..." if self.running else "Starting...")
-            self.item_toggle.set_sensitive(False)
+        self.item_toggle.set_label("Stopping..." if self.running else "Starting...")
+        self.item_toggle.set_sensitive(False)
 
-        def _run_action():
+        try:
+            proc = Gio.Subprocess.new(
+                [RELAY_CMD, action],
+                Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_PIPE,
+            )
+        except GLib.Error as e:
+            self._show_error(f"Error: {e.message}")
+            self._poll_status_once()
+            return
+        # Gio.Subprocess has no timeout of its own; cancel the wait instead
+        cancellable = Gio.Cancellable()
+        timeout_id = GLib.timeout_add_seconds(ACTION_TIMEOUT, self._cancel_on_timeout, cancellable)
+        proc.communicate_utf8_async(
+            None, cancellable, self._on_action_done, (action, cancellable, timeout_id)
+        )
+
+    def _on_action_done(self, proc, result, data):
+        """Runs on the main loop once the toggle action has exited."""
+        action, cancellable, timeout_id = data
+        if cancellable.is_cancelled():
+            proc.force_exit()
+            self._show_error(f"Timed out trying to {action} relay")
+        else:
+            GLib.source_remove(timeout_id)
             try:
-                result = subprocess.run(
-                    [RELAY_CMD, action],
-                    capture_output=True,
-                    text=True,
-                    timeout=15,
-                )
-                if result.returncode != 0:
-                    error = result.stderr.strip() or result.stdout.strip() or "Unknown error"
-                    GLib.idle_add(self._show_error, f"Failed to {action} relay:\n\n{error}")
-            except subprocess.TimeoutExpired:
-                GLib.idle_add(self._show_error, f"Timed out trying to {action} relay")
-            except Exception as e:
-                GLib.idle_add(self._show_error, f"Error: {e}")
-            # Update UI from main thread after action completes
-            GLib.idle_add(self._poll_status_once)
-
-        threading.Thread(target=_run_action, daemon=True).start()
+                _ok, stdout, stderr = proc.communicate_utf8_finish(result)
+                if not proc.get_successful():
+                    error = (stderr or "").strip() or (stdout or "").strip() or "Unknown error"
+                    self._show_error(f"Failed to {action} relay:\n\n{error}")
+            except GLib.Error as e:
+                self._show_error(f"Error: {e.message}")
+        self._poll_status_once()
+
+    def _refresh_status(self):
+        """Force a status refresh, even if the status file looks unchanged."""
+        # Labels may have been changed by hand, and a failed action leaves the
+        # status file untouched, so force a full refresh
+        self._last_stamp = None
+        self._last_state = None
+        self._poll_status()
 
     def _poll_status_once(self):
-        """One-shot status update (for use with GLib.idle_add after actions)."""
-        self._poll_status()
+        """Refresh status and re-enable the toggle once an action has finished."""
+        self._refresh_status()
         # Re-enable toggle button
-        if hasattr(self, "item_toggle"):
-            self.item_toggle.set_sensitive(True)
-        return False  # do NOT repeat
+        self.item_toggle.set_sensitive(True)
 
     def _show_error(self, message):
         dialog = Gtk.MessageDialog(
@@ -220,14 +398,12 @@ class CameraRelaySystray:
             text="Camera Relay Error",
         )
         dialog.format_secondary_text(message)
-        dialog.run()
-        dialog.destroy()
-        return False  # for GLib.idle_add
+        dialog.connect("response", lambda d, _response: d.destroy())
+        dialog.show()
 
     def _on_persistent_toggle(self, _widget):
         if self.persistent:
-            subprocess.Popen([RELAY_CMD, "disable-persistent"])
-            GLib.timeout_add(1000, self._poll_status)
+            self._spawn_relay("disable-persistent")
         else:
             self._show_persistent_warning()
 
@@ -248,13 +424,34 @@ class CameraRelaySystray:
             "  camera-relay disable-persistent"
         )
         dialog.set_title("Camera Relay")
+        dialog.connect("response", self._on_persistent_warning_response)
+        dialog.show()
 
-        response = dialog.run()
+    def _on_persistent_warning_response(self, dialog, response):
         dialog.destroy()
-
         if response == Gtk.ResponseType.OK:
-            subprocess.Popen([RELAY_CMD, "enable-persistent", "--yes"])
-            GLib.timeout_add(1000, self._poll_status)
+            self._spawn_relay("enable-persistent", "--yes")
+
+    def _spawn_relay(self, *args):
+        """Start a camera-relay command and refresh status once it exits."""
+        try:
+            # posix_spawn execs straight away, no fork() of this process.
+            # Reset the signals CPython ignores, as Popen's restore_signals did.
+            pid = os.posix_spawn(
+                RELAY_CMD,
+                [RELAY_CMD, *args],
+                os.environ,
+                setsigdef=(signal.SIGPIPE, signal.SIGXFSZ),
+            )
+        except OSError as e:
+            self._show_error(f"Error: {e}")
+            return
+        # Reaps the child and calls back on the main loop
+        GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, self._on_spawned_exit)
+
+    def _on_spawned_exit(self, _pid, _status):
+        # Leave the start/stop toggle alone; a toggle action may still be running
+        self._refresh_status()
 
     def _on_hide(self, _widget):
         """Just close the indicator — relay keeps running."""
@@ -262,8 +459,7 @@ class CameraRelaySystray:
 
     def _on_stop_and_hide(self, _widget):
         """Stop the relay now but keep persistent enabled (restarts on next login)."""
-        subprocess.run([RELAY_CMD, "stop"], capture_output=True, timeout=10)
-        Gtk.main_quit()
+        self._run_then_quit(("stop",))
 
     def _on_disable_and_hide(self, _widget):
         """Disable persistent mode, stop relay, and close indicator."""
@@ -282,13 +478,43 @@ class CameraRelaySystray:
             "  camera-relay enable-persistent"
         )
         dialog.set_title("Camera Relay")
-        response = dialog.run()
-        dialog.destroy()
+        dialog.connect("response", self._on_disable_response)
+        dialog.show()
 
+    def _on_disable_response(self, dialog, response):
+        dialog.destroy()
         if response == Gtk.ResponseType.OK:
-            subprocess.run([RELAY_CMD, "disable-persistent"], capture_output=True, timeout=10)
-            subprocess.run([RELAY_CMD, "stop"], capture_output=True, timeout=10)
+            self._run_then_quit(("disable-persistent",), ("stop",))
+
+    def _run_then_quit(self, *commands):
+        """Run relay commands in order without blocking, then close the indicator."""
+        if not commands:
             Gtk.main_quit()
+            return
+        try:
+            proc = Gio.Subprocess.new(
+                [RELAY_CMD, *commands[0]],
+                Gio.SubprocessFlags.STDOUT_SILENCE | Gio.SubprocessFlags.STDERR_SILENCE,
+            )
+        except GLib.Error:
+            # Still close as asked; later commands may work on their own
+            self._run_then_quit(*commands[1:])
+            return
+        cancellable = Gio.Cancellable()
+        timeout_id = GLib.timeout_add_seconds(QUIT_TIMEOUT, self._cancel_on_timeout, cancellable)
+        proc.wait_async(cancellable, self._on_quit_step_done, (commands[1:], cancellable, timeout_id))
+
+    def _on_quit_step_done(self, proc, result, data):
+        remaining, cancellable, timeout_id = data
+        if cancellable.is_cancelled():
+            proc.force_exit()
+        else:
+            GLib.source_remove(timeout_id)
+            try:
+                proc.wait_finish(result)
+            except GLib.Error:
+                pass
+        self._run_then_quit(*remaining)
 
 
 if __name__ == "__main__":